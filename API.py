@@ -1,16 +1,31 @@
 # app.py - Azure Database for PostgreSQL Optimized
 # --- Dependencies ---
 # To install the necessary libraries, run:
-# pip install Flask Flask-SQLAlchemy psycopg2-binary python-dotenv
+# pip install Flask Flask-SQLAlchemy psycopg2-binary python-dotenv orjson cachetools msgspec
+# In production, serve with gevent workers instead of app.run():
+# gunicorn -c gunicorn_config.py API:app
 
 import os
+import io
+import csv
+import hashlib
 import logging
 import sys
 import ssl
-from flask import Flask, request, jsonify
+import operator
+import threading
+from itertools import islice
+import msgspec
+import orjson
+import psycopg2
+import psycopg2.extensions
+from cachetools import TTLCache
+from flask import Flask, Response, request
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import exc, create_engine, text
-from datetime import datetime
+from sqlalchemy import exc, text
+from werkzeug.exceptions import RequestEntityTooLarge
+from datetime import date
+from typing import Annotated
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
 
@@ -20,6 +35,10 @@ load_dotenv()
 # --- Basic Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get("MAX_CONTENT_LENGTH", 1 << 20))  # Bounds request body parse work
+BULK_MAX_CONTENT_LENGTH = int(os.environ.get("BULK_MAX_CONTENT_LENGTH", 32 << 20))  # Larger limit for /insert/bulk
+COPY_MAX_CONTENT_LENGTH = int(os.environ.get("COPY_MAX_CONTENT_LENGTH", 256 << 20))  # Streamed CSV limit for /insert/copy
+COPY_BATCH_SIZE = 1000  # Rows per INSERT when /insert/copy cannot use COPY
 
 # --- Azure Database Configuration ---
 DB_USER = os.environ.get("DB_USER")
@@ -27,13 +46,24 @@ DB_PASSWORD_RAW = os.environ.get("DB_PASSWORD")
 DB_HOST = os.environ.get("DB_HOST")
 DB_PORT = os.environ.get("DB_PORT", "5432")
 DB_NAME = os.environ.get("DB_NAME")
-DB_SSLMODE = os.environ.get("DB_SSLMODE", "require")  # Azure requires SSL
+# Optional CA bundle (e.g. DigiCertGlobalRootCA.crt.pem); when set the default sslmode becomes verify-full
+AZURE_SSL_ROOT_CERT_PATH = os.environ.get("AZURE_SSL_ROOT_CERT_PATH")
+USE_SSL_ROOT_CERT = bool(AZURE_SSL_ROOT_CERT_PATH and os.path.exists(AZURE_SSL_ROOT_CERT_PATH))
+DB_SSLMODE = os.environ.get("DB_SSLMODE", "verify-full" if AZURE_SSL_ROOT_CERT_PATH else "require")  # Azure requires SSL
 USE_DATABASE = os.environ.get("USE_DATABASE", "true").lower() == "true"
 
 # Azure-specific settings
 AZURE_SSL_CERT_PATH = os.environ.get("AZURE_SSL_CERT_PATH")  # Optional: path to SSL cert
 CONNECTION_TIMEOUT = int(os.environ.get("CONNECTION_TIMEOUT", "30"))  # Longer timeout for Azure
 COMMAND_TIMEOUT = int(os.environ.get("COMMAND_TIMEOUT", "30"))
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))  # Persistent connections kept per worker
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))  # Extra connections allowed under burst load
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))  # Seconds before a pooled connection is replaced
+RECORDS_CACHE_TTL = int(os.environ.get("RECORDS_CACHE_TTL", "30"))  # Seconds an encoded /display response is reused
+RECORDS_CACHE_MAX_BYTES = int(os.environ.get("RECORDS_CACHE_MAX_BYTES", 16 << 20))  # Per-worker budget for cached pages
+RECORDS_PAGE_SIZE = int(os.environ.get("RECORDS_PAGE_SIZE", "500"))  # Default /display page size
+RECORDS_MAX_PAGE_SIZE = int(os.environ.get("RECORDS_MAX_PAGE_SIZE", "5000"))  # Upper bound for ?limit=
+PING_QUERY = text("SELECT 1")  # Connectivity check shared by the startup probe and /health
 
 logging.info("=== Azure Database Configuration ===")
 logging.info(f"DB_USER: {DB_USER}")
@@ -41,7 +71,9 @@ logging.info(f"DB_HOST: {DB_HOST}")
 logging.info(f"DB_PORT: {DB_PORT}")
 logging.info(f"DB_NAME: {DB_NAME}")
 logging.info(f"DB_SSLMODE: {DB_SSLMODE}")
+logging.info(f"SSL root cert: {AZURE_SSL_ROOT_CERT_PATH if USE_SSL_ROOT_CERT else 'not used'}")
 logging.info(f"CONNECTION_TIMEOUT: {CONNECTION_TIMEOUT}")
+logging.info(f"DB_POOL_SIZE: {DB_POOL_SIZE} (max overflow: {DB_MAX_OVERFLOW})")
 logging.info(f"USE_DATABASE: {USE_DATABASE}")
 logging.info("====================================")
 
@@ -58,6 +90,11 @@ if USE_DATABASE:
         logging.error(f"Missing required environment variables: {', '.join(missing_vars)}")
         logging.info("Starting in NO-DATABASE mode. Set USE_DATABASE=false in .env to suppress this warning.")
         USE_DATABASE = False
+    elif AZURE_SSL_ROOT_CERT_PATH and not USE_SSL_ROOT_CERT:
+        # Refuse to connect rather than silently falling back to an unverified sslmode
+        logging.error(f"AZURE_SSL_ROOT_CERT_PATH is set but the file does not exist: {AZURE_SSL_ROOT_CERT_PATH}")
+        logging.info("Starting in NO-DATABASE mode. Fix the path, or unset it to use sslmode=require.")
+        USE_DATABASE = False
     else:
         if DB_PASSWORD_RAW:
             DB_PASSWORD_ENCODED = quote_plus(DB_PASSWORD_RAW)
@@ -80,121 +117,206 @@ if USE_DATABASE:
         app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
         app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': DB_POOL_SIZE,
+            'max_overflow': DB_MAX_OVERFLOW,
             'pool_timeout': CONNECTION_TIMEOUT,
-            'pool_recycle': 300,  # Recycle connections every 5 minutes
+            'pool_recycle': DB_POOL_RECYCLE,  # Long-lived connections avoid repeated TLS handshakes
             'pool_pre_ping': True,  # Verify connections before use
+            'executemany_mode': 'values_plus_batch',  # Batch multi-row writes into few round-trips
+            'insertmanyvalues_page_size': 1000,  # Rows per multi-VALUES INSERT statement
             'connect_args': {
                 'connect_timeout': CONNECTION_TIMEOUT,
                 'application_name': 'flask_edi_api',
                 'sslmode': DB_SSLMODE,
-                'options': f'-c statement_timeout={COMMAND_TIMEOUT}s'
+                'options': f'-c statement_timeout={COMMAND_TIMEOUT}s',
+                # TCP keepalives stop Azure's idle-connection timeout from dropping pooled sockets
+                'keepalives': 1,
+                'keepalives_idle': 60,
+                'keepalives_interval': 10,
+                'keepalives_count': 5
             }
         }
-        
-        # Test database connection before initializing SQLAlchemy
-        logging.info("Testing Azure database connection...")
-        try:
-            # Create a test engine with Azure-specific settings
-            test_engine = create_engine(
-                database_uri,
-                connect_args={
-                    "connect_timeout": CONNECTION_TIMEOUT,
-                    "application_name": "flask_app_test",
-                    "sslmode": DB_SSLMODE,
-                    "options": f"-c statement_timeout={COMMAND_TIMEOUT}s"
-                },
-                pool_timeout=CONNECTION_TIMEOUT,
-                pool_recycle=300,
-                pool_pre_ping=True
-            )
-            
-            # Test the connection
-            with test_engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                logging.info("✅ Azure database connection successful!")
-                db_connected = True
-                
-        except Exception as e:
-            logging.error(f"❌ Azure database connection failed: {str(e)}")
-            logging.error("Common Azure issues:")
-            logging.error("1. Check if your IP is whitelisted in Azure firewall rules")
-            logging.error("2. Verify SSL settings (Azure requires sslmode=require)")
-            logging.error("3. Check if the server name format is correct: servername.postgres.database.azure.com")
-            logging.error("4. Ensure the username format is correct: username@servername")
-            logging.info("Starting in NO-DATABASE mode...")
-            USE_DATABASE = False
-            db_connected = False
+        if USE_SSL_ROOT_CERT:
+            app.config['SQLALCHEMY_ENGINE_OPTIONS']['connect_args']['sslrootcert'] = AZURE_SSL_ROOT_CERT_PATH
 
-if USE_DATABASE and db_connected:
-    # Initialize SQLAlchemy only if database is accessible
+if USE_DATABASE:
+    # Initialize SQLAlchemy first so the connectivity probe below runs on the
+    # same engine and pool the app uses, instead of a throwaway test engine
     try:
-        db = SQLAlchemy(app)
+        # Keep instances loaded after commit: responses are built from the
+        # just-committed object, which would otherwise be re-SELECTed
+        db = SQLAlchemy(app, session_options={'expire_on_commit': False})
         logging.info("✅ SQLAlchemy initialized successfully")
     except Exception as e:
         logging.error(f"❌ Failed to initialize SQLAlchemy: {str(e)}")
         USE_DATABASE = False
+
+if USE_DATABASE:
+    logging.info("Testing Azure database connection...")
+    try:
+        with app.app_context():
+            with db.engine.connect() as conn:
+                conn.execute(PING_QUERY)
+            # Drop the probe connection rather than leaving it idle in the
+            # pool; with gunicorn's preload_app it would otherwise be shared
+            # by every forked worker. pool_pre_ping covers the first request.
+            db.engine.dispose()
+        logging.info("✅ Azure database connection successful!")
+        db_connected = True
+
+    except Exception as e:
+        logging.error(f"❌ Azure database connection failed: {str(e)}")
+        logging.error("Common Azure issues:")
+        logging.error("1. Check if your IP is whitelisted in Azure firewall rules")
+        logging.error("2. Verify SSL settings (Azure requires SSL: sslmode=require, or verify-full with AZURE_SSL_ROOT_CERT_PATH)")
+        logging.error("3. Check if the server name format is correct: servername.postgres.database.azure.com")
+        logging.error("4. Ensure the username format is correct: username@servername")
+        logging.info("Starting in NO-DATABASE mode...")
+        USE_DATABASE = False
         db_connected = False
-else:
+
+if not (USE_DATABASE and db_connected):
     # No database mode - use in-memory storage
     logging.info("🔄 Running in NO-DATABASE mode with in-memory storage")
     
-    # In-memory storage for records
-    in_memory_records = []
+    # In-memory storage for records, keyed by ID (insertion order == ID order)
+    in_memory_records = {}
     next_id = 1
 
 # --- Database Model Definition (only if using database) ---
 if USE_DATABASE and db_connected:
     class EdiRecord(db.Model):
         __tablename__ = 'edi_records'
+        __table_args__ = (
+            db.Index('ix_edi_client_product_date', 'ClientCode', 'ProductCode', 'Date'),
+            db.Index('ix_edi_delivery_date', 'ExpectedDeliveryDate'),
+        )
 
         ID = db.Column(db.Integer, primary_key=True)
         ClientCode = db.Column(db.String(50), nullable=False)
         ProductCode = db.Column(db.String(50), nullable=False)
-        Date = db.Column(db.String(20), nullable=False)
+        Date = db.Column(db.Date, nullable=False)
         Quantity = db.Column(db.Integer, nullable=False)
         EDIWeekNumber = db.Column(db.Integer, nullable=True)
-        ExpectedDeliveryDate = db.Column(db.String(20), nullable=True)
+        ExpectedDeliveryDate = db.Column(db.Date, nullable=True)
         DeliveryNature = db.Column(db.String(100), nullable=True)
         DeliveredQuantity = db.Column(db.Integer, nullable=True)
 
         def to_dict(self):
-            return {
-                "ID": self.ID,
-                "ClientCode": self.ClientCode,
-                "ProductCode": self.ProductCode,
-                "Date": self.Date,
-                "Quantity": self.Quantity,
-                "EDIWeekNumber": self.EDIWeekNumber,
-                "ExpectedDeliveryDate": self.ExpectedDeliveryDate,
-                "DeliveryNature": self.DeliveryNature,
-                "DeliveredQuantity": self.DeliveredQuantity
-            }
+            # One C-level attrgetter call fetches every column; dates stay
+            # datetime.date and are written as ISO strings by orjson
+            return dict(zip(RECORD_FIELDS, RECORD_GETTER(self)))
+
+    # Serialized field names, read once from the mapped table so they can't
+    # drift from the column definitions above
+    RECORD_FIELDS = tuple(EdiRecord.__table__.columns.keys())
+    RECORD_GETTER = operator.attrgetter(*RECORD_FIELDS)
+
+    # One keyset page as a JSON array rendered by Postgres (keys match to_dict()),
+    # plus the last ID and row count for the next cursor. The inner query is a
+    # primary-key range scan. string_agg keeps the output compact; json_agg
+    # would add a newline per row.
+    RECORDS_PAGE_QUERY = text(
+        "SELECT '[' || COALESCE(string_agg(row_to_json(t)::text, ',' ORDER BY t.\"ID\"), '') || ']', "
+        "MAX(t.\"ID\"), COUNT(*) "
+        f"FROM (SELECT * FROM {EdiRecord.__tablename__} WHERE \"ID\" > :after_id "
+        "ORDER BY \"ID\" LIMIT :limit) t"
+    )
+
+    # Version of one page for ETags: last ID and row count of the requested
+    # window. An index-only range scan bounded by :limit, so full pages keep
+    # their ETag while new rows still change the tail page's.
+    RECORDS_VERSION_QUERY = text(
+        "SELECT MAX(t.\"ID\"), COUNT(*) "
+        f"FROM (SELECT \"ID\" FROM {EdiRecord.__tablename__} WHERE \"ID\" > :after_id "
+        "ORDER BY \"ID\" LIMIT :limit) t"
+    )
+
+# --- Request payload schema (compiled once; decodes and validates in one pass) ---
+# Postgres INTEGER (int4) range, mirrored like the VARCHAR lengths below
+Int4 = Annotated[int, msgspec.Meta(ge=-2**31, le=2**31 - 1)]
+
+class EdiRecordIn(msgspec.Struct):
+    ClientCode: Annotated[str, msgspec.Meta(max_length=50)]
+    ProductCode: Annotated[str, msgspec.Meta(max_length=50)]
+    Date: date
+    Quantity: Int4
+    EDIWeekNumber: Int4 | None = None
+    ExpectedDeliveryDate: date | None = None
+    DeliveryNature: Annotated[str, msgspec.Meta(max_length=100)] | None = None
+    DeliveredQuantity: Int4 | None = None
+
+record_decoder = msgspec.json.Decoder(EdiRecordIn)
+records_decoder = msgspec.json.Decoder(list[EdiRecordIn])
+
+# CSV column order for /insert/copy (every column except the generated ID)
+COPY_COLUMNS = EdiRecordIn.__struct_fields__
+
+if USE_DATABASE and db_connected:
+    copy_column_list = ', '.join(f'"{name}"' for name in COPY_COLUMNS)
+    COPY_SQL = f"COPY {EdiRecord.__tablename__} ({copy_column_list}) FROM STDIN WITH (FORMAT csv, HEADER true)"
+
+# An empty body or a lone header row is rejected like an empty /insert/bulk
+# array, so a truncated upload is not reported as a successful load
+EMPTY_CSV_ERROR = "Expected at least one CSV record"
+
+def iter_csv_records(stream):
+    """Yields validated record dicts from a CSV body laid out like COPY_SQL expects."""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8', newline=''))
+    next(reader, None)  # Header row, skipped like COPY ... HEADER true
+    for row in reader:
+        if len(row) != len(COPY_COLUMNS):
+            raise msgspec.ValidationError(f"Expected {len(COPY_COLUMNS)} columns, got {len(row)} (CSV line {reader.line_num})")
+        # Empty fields are NULL, as in COPY's CSV format
+        values = {name: value if value != '' else None for name, value in zip(COPY_COLUMNS, row)}
+        try:
+            record = msgspec.convert(values, EdiRecordIn, strict=False)
+        except msgspec.ValidationError as e:
+            raise msgspec.ValidationError(f"{e} (CSV line {reader.line_num})") from None
+        yield msgspec.structs.asdict(record)
+
+# Encoded /display pages, per worker process, keyed by (RECORDS_CACHE_KEY, ETag).
+# The ETag covers the page parameters and the rows in that page's window, so
+# writes made through any worker change the key; writes through this worker
+# also clear it.
+RECORDS_CACHE_KEY = 'records:v1'
+# Sized by payload length rather than entry count: a single page can be ~1 MB
+records_cache = TTLCache(maxsize=RECORDS_CACHE_MAX_BYTES, ttl=RECORDS_CACHE_TTL, getsizeof=len)
+records_cache_lock = threading.Lock()
+
+def invalidate_records_cache():
+    with records_cache_lock:
+        records_cache.clear()
+
+def records_etag(after_id, limit, max_id, count):
+    """ETag for one /display page, derived from its parameters and its window's version."""
+    return hashlib.blake2b(f"{after_id}-{limit}-{max_id}-{count}".encode(), digest_size=8).hexdigest()
 
 # --- Helper functions for in-memory storage ---
 def create_in_memory_record(data):
     global next_id
-    record = {
-        "ID": next_id,
-        "ClientCode": data['ClientCode'],
-        "ProductCode": data['ProductCode'],
-        "Date": data['Date'],
-        "Quantity": data['Quantity'],
-        "EDIWeekNumber": data.get('EDIWeekNumber'),
-        "ExpectedDeliveryDate": data.get('ExpectedDeliveryDate'),
-        "DeliveryNature": data.get('DeliveryNature'),
-        "DeliveredQuantity": data.get('DeliveredQuantity')
-    }
-    in_memory_records.append(record)
+    # data comes from msgspec.structs.asdict(EdiRecordIn), so every column key
+    # is already present in declaration order
+    record = {"ID": next_id, **data}
+    in_memory_records[next_id] = record
     next_id += 1
     return record
 
+def ojsonify(obj, status=200):
+    """Serializes obj with orjson straight to bytes and wraps it in a JSON response."""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
 # --- API Endpoints (Routes) ---
 
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return ojsonify({"error": f"Payload too large. Limit is {request.max_content_length} bytes"}, 413)
+
 @app.route('/')
 def index():
     """A simple root endpoint to confirm the API is running."""
     mode = "Azure Database" if (USE_DATABASE and db_connected) else "In-Memory"
-    return jsonify({
+    return ojsonify({
         "message": "EDI Records API is running. Use /records to interact.",
         "mode": mode,
         "database_connected": db_connected,
@@ -203,69 +325,237 @@ def index():
 
 @app.route('/display', methods=['GET'])
 def get_records():
-    """Retrieves all EDI records."""
+    """Retrieves EDI records one page at a time (?after_id=<last ID seen>&limit=<n>)."""
+    try:
+        after_id = int(request.args.get('after_id', 0))
+        limit = min(int(request.args.get('limit', RECORDS_PAGE_SIZE)), RECORDS_MAX_PAGE_SIZE)
+    except ValueError:
+        return ojsonify({"error": "Invalid query. after_id and limit must be integers"}, 400)
+    if limit < 1:
+        return ojsonify({"error": "Invalid query. limit must be at least 1"}, 400)
+
     try:
         if USE_DATABASE and db_connected:
-            # Use database with timeout handling
-            records = EdiRecord.query.order_by(EdiRecord.ID).all()
-            return jsonify([record.to_dict() for record in records])
+            max_id, count = db.session.execute(
+                RECORDS_VERSION_QUERY, {"after_id": after_id, "limit": limit}
+            ).one()
         else:
-            # Use in-memory storage
-            return jsonify(sorted(in_memory_records, key=lambda x: x['ID']))
+            # IDs are assigned sequentially, so a page is a run of O(1) lookups
+            # starting right after the cursor; no sort and no full scan
+            items = []
+            for record_id in range(max(after_id, 0) + 1, next_id):
+                record = in_memory_records.get(record_id)
+                if record is not None:
+                    items.append(record)
+                    if len(items) == limit:
+                        break
+            max_id, count = (items[-1]['ID'] if items else None), len(items)
+        etag = records_etag(after_id, limit, max_id, count)
+        # Weak comparison, as RFC 9110 requires for If-None-Match; proxies and
+        # compression layers may hand the tag back as W/"..."
+        if request.if_none_match.contains_weak(etag):
+            # Client already has this page; skip both the query and the transfer
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        if USE_DATABASE and db_connected:
+            cache_key = (RECORDS_CACHE_KEY, etag)
+            with records_cache_lock:
+                payload = records_cache.get(cache_key)
+            if payload is None:
+                # Postgres builds the JSON array server-side in a single scan;
+                # the app only splices it into the page envelope
+                items, last_id, page_count = db.session.execute(
+                    RECORDS_PAGE_QUERY, {"after_id": after_id, "limit": limit}
+                ).one()
+                next_after_id = last_id if page_count == limit else None
+                payload = f'{{"items":{items},"next_after_id":{orjson.dumps(next_after_id).decode()}}}'
+                if len(payload) <= RECORDS_CACHE_MAX_BYTES:  # TTLCache rejects oversized values
+                    with records_cache_lock:
+                        records_cache[cache_key] = payload
+            response = Response(payload, mimetype='application/json')
+        else:
+            # Use in-memory storage; items were collected for the ETag above
+            response = ojsonify({
+                "items": items,
+                "next_after_id": items[-1]['ID'] if len(items) == limit else None
+            })
+        response.set_etag(etag)
+        return response
     except exc.SQLAlchemyError as e:
         logging.error(f"Database error in get_records: {str(e)}")
-        return jsonify({"error": f"Database error: {str(e)}"}), 500
+        return ojsonify({"error": f"Database error: {str(e)}"}, 500)
     except Exception as e:
         logging.error(f"Unexpected error in get_records: {str(e)}")
-        return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
+        return ojsonify({"error": f"An unexpected error occurred: {str(e)}"}, 500)
 
 @app.route('/insert', methods=['POST'])
 def add_record():
     """Adds a new EDI record."""
-    data = request.get_json()
-
-    required_fields = ["ClientCode", "ProductCode", "Date", "Quantity"]
-    if not data or not all(field in data for field in required_fields):
-        return jsonify({"error": f"Invalid payload. Required fields are: {required_fields}"}), 400
+    try:
+        data = msgspec.structs.asdict(record_decoder.decode(request.get_data(cache=False)))
+    except msgspec.ValidationError as e:
+        return ojsonify({"error": f"Invalid payload. {e}"}, 400)
+    except msgspec.DecodeError:
+        return ojsonify({"error": "Invalid payload. Body must be valid JSON"}, 400)
 
     try:
         if USE_DATABASE and db_connected:
             # Use database
-            new_record = EdiRecord(
-                ClientCode=data['ClientCode'],
-                ProductCode=data['ProductCode'],
-                Date=data['Date'],
-                Quantity=data['Quantity'],
-                EDIWeekNumber=data.get('EDIWeekNumber'),
-                ExpectedDeliveryDate=data.get('ExpectedDeliveryDate'),
-                DeliveryNature=data.get('DeliveryNature'),
-                DeliveredQuantity=data.get('DeliveredQuantity')
-            )
+            new_record = EdiRecord(**data)
             db.session.add(new_record)
             db.session.commit()
+            invalidate_records_cache()
             
-            return jsonify({
+            return ojsonify({
                 "message": "Record added successfully",
                 "record": new_record.to_dict()
-            }), 201
+            }, 201)
         else:
             # Use in-memory storage
             new_record = create_in_memory_record(data)
-            return jsonify({
+            return ojsonify({
                 "message": "Record added successfully (in-memory)",
                 "record": new_record
-            }), 201
+            }, 201)
             
     except exc.SQLAlchemyError as e:
         if USE_DATABASE and db_connected:
             db.session.rollback()
         logging.error(f"Database error in add_record: {str(e)}")
-        return jsonify({"error": f"Database error: {str(e)}"}), 500
+        return ojsonify({"error": f"Database error: {str(e)}"}, 500)
     except Exception as e:
         if USE_DATABASE and db_connected:
             db.session.rollback()
         logging.error(f"Unexpected error in add_record: {str(e)}")
-        return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
+        return ojsonify({"error": f"An unexpected error occurred: {str(e)}"}, 500)
+
+@app.route('/insert/bulk', methods=['POST'])
+def add_records_bulk():
+    """Adds many EDI records from a JSON array in a single batched INSERT."""
+    request.max_content_length = BULK_MAX_CONTENT_LENGTH
+    try:
+        data = [msgspec.structs.asdict(item) for item in records_decoder.decode(request.get_data(cache=False))]
+    except msgspec.ValidationError as e:
+        return ojsonify({"error": f"Invalid payload. {e}"}, 400)
+    except msgspec.DecodeError:
+        return ojsonify({"error": "Invalid payload. Body must be valid JSON"}, 400)
+
+    if not data:
+        return ojsonify({"error": "Invalid payload. Expected a non-empty JSON array of records"}, 400)
+
+    try:
+        if USE_DATABASE and db_connected:
+            # Use database: one executemany, sent by psycopg2 as multi-row VALUES pages
+            db.session.execute(EdiRecord.__table__.insert(), data)
+            db.session.commit()
+            invalidate_records_cache()
+
+            return ojsonify({
+                "message": f"{len(data)} records added successfully",
+                "count": len(data)
+            }, 201)
+        else:
+            # Use in-memory storage
+            for item in data:
+                create_in_memory_record(item)
+            return ojsonify({
+                "message": f"{len(data)} records added successfully (in-memory)",
+                "count": len(data)
+            }, 201)
+
+    except exc.SQLAlchemyError as e:
+        if USE_DATABASE and db_connected:
+            db.session.rollback()
+        logging.error(f"Database error in add_records_bulk: {str(e)}")
+        return ojsonify({"error": f"Database error: {str(e)}"}, 500)
+    except Exception as e:
+        if USE_DATABASE and db_connected:
+            db.session.rollback()
+        logging.error(f"Unexpected error in add_records_bulk: {str(e)}")
+        return ojsonify({"error": f"An unexpected error occurred: {str(e)}"}, 500)
+
+@app.route('/insert/copy', methods=['POST'])
+def add_records_copy():
+    """Bulk-loads EDI records from a text/csv body (header row, then COPY_COLUMNS in order).
+
+    Dates must be ISO 8601 (YYYY-MM-DD): that is all the INSERT fallback and
+    in-memory mode accept, whereas COPY would also take other DateStyle forms.
+    """
+    request.max_content_length = COPY_MAX_CONTENT_LENGTH
+    stream = request.stream
+
+    try:
+        if USE_DATABASE and db_connected:
+            if psycopg2.extensions.get_wait_callback() is None:
+                # Stream the body straight into COPY FROM STDIN; nothing is buffered in Python
+                conn = db.engine.raw_connection()
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.copy_expert(COPY_SQL, stream)
+                        count = cursor.rowcount
+                    if not count:
+                        raise msgspec.ValidationError(EMPTY_CSV_ERROR)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.close()
+            else:
+                # Green (psycogreen) connections cannot run COPY; fall back to
+                # batched multi-row INSERTs over the same streamed CSV
+                count = 0
+                rows = iter_csv_records(stream)
+                while batch := list(islice(rows, COPY_BATCH_SIZE)):
+                    db.session.execute(EdiRecord.__table__.insert(), batch)
+                    count += len(batch)
+                if not count:
+                    raise msgspec.ValidationError(EMPTY_CSV_ERROR)
+                db.session.commit()
+            invalidate_records_cache()
+
+            return ojsonify({
+                "message": f"{count} records added successfully",
+                "count": count
+            }, 201)
+        else:
+            # Use in-memory storage (validate everything before storing anything)
+            records = list(iter_csv_records(stream))
+            if not records:
+                raise msgspec.ValidationError(EMPTY_CSV_ERROR)
+            for record in records:
+                create_in_memory_record(record)
+            return ojsonify({
+                "message": f"{len(records)} records added successfully (in-memory)",
+                "count": len(records)
+            }, 201)
+
+    except RequestEntityTooLarge:
+        raise
+    except (msgspec.ValidationError, UnicodeDecodeError, csv.Error) as e:
+        if USE_DATABASE and db_connected:
+            db.session.rollback()
+        return ojsonify({"error": f"Invalid payload. {e}"}, 400)
+    except (psycopg2.DataError, psycopg2.IntegrityError, exc.DataError, exc.IntegrityError) as e:
+        # Rows Postgres rejects (NOT NULL, int4 range, ...) from either branch;
+        # SQLAlchemy's wrappers carry the driver error, without the batch's SQL, in .orig
+        if USE_DATABASE and db_connected:
+            db.session.rollback()
+        error = getattr(e, 'orig', e)
+        logging.error(f"Rejected CSV in add_records_copy: {str(error)}")
+        return ojsonify({"error": f"Invalid payload. {str(error).strip()}"}, 400)
+    except (exc.SQLAlchemyError, psycopg2.Error) as e:
+        if USE_DATABASE and db_connected:
+            db.session.rollback()
+        logging.error(f"Database error in add_records_copy: {str(e)}")
+        return ojsonify({"error": f"Database error: {str(e)}"}, 500)
+    except Exception as e:
+        if USE_DATABASE and db_connected:
+            db.session.rollback()
+        logging.error(f"Unexpected error in add_records_copy: {str(e)}")
+        return ojsonify({"error": f"An unexpected error occurred: {str(e)}"}, 500)
 
 # --- Health check endpoint ---
 @app.route('/health', methods=['GET'])
@@ -274,38 +564,39 @@ def health_check():
     if USE_DATABASE and db_connected:
         try:
             # Test database connection with timeout
-            result = db.session.execute(text('SELECT 1'))
-            return jsonify({
+            db.session.execute(PING_QUERY)
+            return ojsonify({
                 "status": "healthy", 
                 "database": "connected",
                 "mode": "azure_database",
                 "ssl_mode": DB_SSLMODE
-            }), 200
+            }, 200)
         except Exception as e:
             logging.error(f"Health check failed: {str(e)}")
-            return jsonify({
+            return ojsonify({
                 "status": "unhealthy", 
                 "database": "disconnected",
                 "error": str(e),
                 "mode": "azure_database"
-            }), 500
+            }, 500)
     else:
-        return jsonify({
+        return ojsonify({
             "status": "healthy",
             "database": "not_used",
             "mode": "in-memory"
-        }), 200
+        }, 200)
 
 @app.route('/azure-info', methods=['GET'])
 def azure_info():
     """Azure-specific information endpoint."""
-    return jsonify({
+    return ojsonify({
         "azure_host": DB_HOST,
         "ssl_mode": DB_SSLMODE,
         "connection_timeout": CONNECTION_TIMEOUT,
         "command_timeout": COMMAND_TIMEOUT,
         "database_connected": db_connected,
         "using_ssl_cert": bool(AZURE_SSL_CERT_PATH and os.path.exists(AZURE_SSL_CERT_PATH)),
+        "using_ssl_root_cert": USE_SSL_ROOT_CERT,
         "tips": [
             "Ensure your IP is whitelisted in Azure firewall",
             "Use format: username@servername for DB_USER",
@@ -0,0 +1,33 @@
+# gunicorn_config.py - Production server settings for the EDI Records API
+# Run with:
+# gunicorn -c gunicorn_config.py API:app
+
+import os
+import multiprocessing
+
+# Patch the stdlib and psycopg2 before the app (and its ssl/socket imports) is
+# loaded by preload_app, so Postgres waits yield to other greenlets
+from gevent import monkey
+monkey.patch_all()
+
+from psycogreen.gevent import patch_psycopg
+patch_psycopg()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "gevent"
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Report greenlets that block the event loop. Started per worker: a
+    # monitor thread created in the preloaded master does not survive fork,
+    # which is why this is not driven by GEVENT_MONITOR_THREAD_ENABLE.
+    if os.environ.get("GUNICORN_GEVENT_MONITOR", "1").lower() in ("1", "true"):
+        from gevent import config, get_hub
+        config.monitor_thread = True
+        get_hub().start_periodic_monitoring_thread()
@@ -0,0 +1,10 @@
+-- Secondary indexes for edi_records.
+-- db.create_all() only creates these for a brand-new table; run this once
+-- against an existing database. CONCURRENTLY avoids locking out writes,
+-- so run it outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_edi_client_product_date
+    ON edi_records ("ClientCode", "ProductCode", "Date");
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_edi_delivery_date
+    ON edi_records ("ExpectedDeliveryDate");
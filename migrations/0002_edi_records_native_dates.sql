@@ -0,0 +1,12 @@
+-- Convert the VARCHAR date columns of edi_records to native DATE.
+-- Existing values must already be parseable by Postgres (e.g. YYYY-MM-DD);
+-- empty strings in ExpectedDeliveryDate become NULL. Rewrites the table
+-- and rebuilds the indexes that cover these columns.
+
+BEGIN;
+
+ALTER TABLE edi_records
+    ALTER COLUMN "Date" TYPE date USING "Date"::date,
+    ALTER COLUMN "ExpectedDeliveryDate" TYPE date USING NULLIF("ExpectedDeliveryDate", '')::date;
+
+COMMIT;